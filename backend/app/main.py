@@ -5,20 +5,39 @@ The Oracle Engine that validates Decklists (MCP servers) and tracks
 Planeswalker progress through their journey.
 """
 
-from fastapi import FastAPI
+import re
+from contextlib import asynccontextmanager
+from functools import cache
+
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.routers import validation, progress, snippets, content
 from app.services.database import get_database
 from app.config import get_settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the content caches and the database service before serving."""
+    content.preload_content()
+    _health_body()
+    yield
+    await get_database().close()
+
+
 app = FastAPI(
     title="The Artificer's Academy API",
     description="Backend API for the MCP learning platform",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for frontend communication
+@cache
 def get_cors_origins() -> list[str]:
     """Build list of allowed CORS origins."""
     settings = get_settings()
@@ -27,18 +46,14 @@ def get_cors_origins() -> list[str]:
     ]
 
     # Add production frontend URL if configured
+    # (Vercel preview deployments are matched by get_cors_regex)
     if settings.frontend_url:
         origins.append(settings.frontend_url)
 
-        # Also allow Vercel preview deployments for the same project
-        # Extract project name from production URL for preview pattern
-        # e.g., https://myapp.vercel.app -> also allow https://myapp-*-username.vercel.app
-        if "vercel.app" in settings.frontend_url:
-            origins.append(settings.frontend_url.replace("https://", "https://*-"))
-
     return origins
 
 
+@cache
 def get_cors_regex() -> str | None:
     """Get CORS origin regex pattern for preview deployments."""
     settings = get_settings()
@@ -50,7 +65,7 @@ def get_cors_regex() -> str | None:
         # Production: https://myapp.vercel.app
         # Previews:   https://myapp-git-branch-user.vercel.app
         app_name = settings.frontend_url.replace("https://", "").replace(".vercel.app", "")
-        return rf"https://{app_name}(-[a-z0-9-]+)?\.vercel\.app"
+        return rf"https://{re.escape(app_name)}(-[a-z0-9-]+)?\.vercel\.app"
 
     return None
 
@@ -63,8 +78,10 @@ app.add_middleware(
     allow_origins=cors_origins,
     allow_origin_regex=cors_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (the methods/headers the API and frontend actually use)
+    # let Starlette build the preflight response once instead of echoing
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "if-none-match"],
 )
 
 # Include routers
@@ -83,14 +100,25 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """Health check for deployment monitoring."""
+@cache
+def _health_body() -> bytes:
+    """
+    Encode the health payload once.
+
+    Environment and database mode are fixed once the database service
+    has been created, so the body never changes for the process.
+    """
     settings = get_settings()
     db = get_database()
 
-    return {
+    return orjson.dumps({
         "status": "healthy",
         "database": "connected" if db.is_connected else "in-memory",
         "environment": settings.environment,
-    }
+    })
+
+
+@app.get("/health")
+async def health_check() -> Response:
+    """Health check for deployment monitoring."""
+    return Response(content=_health_body(), media_type="application/json")
@@ -7,20 +7,36 @@ In the language of the Grand Artificer:
 - ValidationResponse: The Inspector's verdict
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Annotated, Optional
 
 VALID_MODES = {"simple", "detailed", "mtg"}
 
+# Longest accepted code submission, in characters
+MAX_CODE_LENGTH = 100_000
+
+# Shared constrained types (one core schema reused across models)
+IdStr = Annotated[str, Field(min_length=1, max_length=50)]
+"""A level/phase identifier."""
+
+CodeStr = Annotated[str, Field(max_length=MAX_CODE_LENGTH)]
+"""Submitted Python source (max 100KB)."""
+
+
+class ResponseModel(BaseModel):
+    """Base for read-only response models (immutable once built)."""
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
 
 class ValidationRequest(BaseModel):
     """A Decklist (Python code) submitted for validation."""
 
-    code: str = Field(..., max_length=100_000, description="The Python code to validate")
+    code: CodeStr = Field(..., description="The Python code to validate")
     """The Python code to validate (max 100KB)."""
 
 
-class ValidationError(BaseModel):
+class ValidationError(ResponseModel):
     """A Counterspell - an error found during validation."""
 
     type: str
@@ -33,7 +49,7 @@ class ValidationError(BaseModel):
     """Human-readable error message in Grand Artificer style."""
 
 
-class ValidationResponse(BaseModel):
+class ValidationResponse(ResponseModel):
     """The Inspector's verdict on a submitted Decklist."""
 
     valid: bool
@@ -86,16 +102,16 @@ class ProgressEntry(BaseModel):
 class ProgressUpdate(BaseModel):
     """Progress update for a user's journey through a level."""
 
-    level_id: str = Field(..., min_length=1, max_length=50)
+    level_id: IdStr
     """The level identifier (e.g., 'level1')."""
 
-    phase_id: str = Field(..., min_length=1, max_length=50)
+    phase_id: IdStr
     """The phase identifier (e.g., 'phase1')."""
 
     completed: bool = False
     """Whether this phase is completed."""
 
-    code_snapshot: Optional[str] = Field(None, max_length=100_000)
+    code_snapshot: Optional[CodeStr] = None
     """Optional code snapshot to save (max 100KB)."""
 
     mode: str = Field(default="mtg", description="Learning mode")
@@ -108,7 +124,7 @@ class ProgressUpdate(BaseModel):
         return v
 
 
-class ProgressResponse(BaseModel):
+class ProgressResponse(ResponseModel):
     """Response containing user's progress data."""
 
     user_id: str
@@ -118,7 +134,7 @@ class ProgressResponse(BaseModel):
     """List of progress entries."""
 
 
-class ProgressUpdateResponse(BaseModel):
+class ProgressUpdateResponse(ResponseModel):
     """Response after updating progress."""
 
     status: str
@@ -135,23 +151,23 @@ class ProgressUpdateResponse(BaseModel):
 class SnippetCreate(BaseModel):
     """Request to save a new code snippet (Decklist)."""
 
-    level_id: str = Field(..., min_length=1, max_length=50)
+    level_id: IdStr
     """The level this snippet is associated with."""
 
     title: str = Field(..., min_length=1, max_length=200)
     """Title for the snippet."""
 
-    code: str = Field(..., max_length=100_000)
+    code: CodeStr
     """The code content (max 100KB)."""
 
     is_valid: bool = False
     """Whether the code passed validation."""
 
-    validation_result: Optional[dict] = None
+    validation_result: Optional[ValidationResponse] = None
     """Full validation response if available."""
 
 
-class SnippetResponse(BaseModel):
+class SnippetResponse(ResponseModel):
     """Response containing a saved snippet."""
 
     id: str
@@ -169,21 +185,21 @@ class SnippetResponse(BaseModel):
     is_valid: bool
     """Whether the code passed validation."""
 
-    validation_result: Optional[dict] = None
+    validation_result: Optional[ValidationResponse] = None
     """Full validation response if available."""
 
     created_at: Optional[str] = None
     """When the snippet was created."""
 
 
-class SnippetListResponse(BaseModel):
+class SnippetListResponse(ResponseModel):
     """Response containing a list of snippets."""
 
     snippets: list[SnippetResponse]
     """List of saved snippets."""
 
 
-class SnippetCreateResponse(BaseModel):
+class SnippetCreateResponse(ResponseModel):
     """Response after creating a snippet."""
 
     id: str
@@ -193,7 +209,7 @@ class SnippetCreateResponse(BaseModel):
     """Human-readable message."""
 
 
-class SnippetDeleteResponse(BaseModel):
+class SnippetDeleteResponse(ResponseModel):
     """Response after deleting a snippet."""
 
     status: str
@@ -207,7 +223,7 @@ class SnippetDeleteResponse(BaseModel):
 # Content/Curriculum Models
 # ==========================================
 
-class Phase(BaseModel):
+class Phase(ResponseModel):
     """A single phase within a level."""
 
     id: str
@@ -229,7 +245,7 @@ class Phase(BaseModel):
     """Whether code validation is required to complete."""
 
 
-class Level(BaseModel):
+class Level(ResponseModel):
     """A level in the curriculum (e.g., The Sanctum)."""
 
     id: str
@@ -254,14 +270,14 @@ class Level(BaseModel):
     """Whether the level is locked."""
 
 
-class CurriculumResponse(BaseModel):
+class CurriculumResponse(ResponseModel):
     """Full curriculum structure."""
 
     levels: list[Level]
     """All available levels."""
 
 
-class PhaseContentResponse(BaseModel):
+class PhaseContentResponse(ResponseModel):
     """Response containing phase markdown content."""
 
     level_id: str
@@ -281,7 +297,7 @@ class PhaseContentResponse(BaseModel):
 # User Preference Models
 # ==========================================
 
-class UserPreference(BaseModel):
+class UserPreference(ResponseModel):
     """User's learning mode preference."""
 
     user_id: str
@@ -6,14 +6,21 @@ The Artificer's Academy learning platform. Supports multiple
 learning modes (simple, detailed, mtg).
 """
 
-import json
+import hashlib
 import logging
-import re
-from functools import lru_cache
+import os
+import string
+import time
+from collections.abc import Mapping
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import NamedTuple
 
-from fastapi import APIRouter, HTTPException, Path as PathParam, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Path as PathParam, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 
 from app.models.schemas import (
     VALID_MODES,
@@ -29,17 +36,36 @@ logger = logging.getLogger(__name__)
 # Path to content directory (relative to backend root)
 CONTENT_DIR = Path(__file__).parent.parent.parent / "content"
 
-# Pattern for valid IDs (alphanumeric, underscores, hyphens)
-VALID_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+# Resolved once so content paths can be checked without filesystem calls
+_CONTENT_DIR_RESOLVED = CONTENT_DIR.resolve()
+_CONTENT_DIR_PREFIX = str(_CONTENT_DIR_RESOLVED) + os.sep
+
+# Curriculum file for each learning mode
+_CURRICULUM_PATHS = {
+    mode: _CONTENT_DIR_RESOLVED / f"curriculum-{mode}.json" for mode in VALID_MODES
+}
+
+# Cache-Control for curriculum responses (static between deploys)
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+# Longest accepted level/phase ID (mirrors the path parameter constraint)
+MAX_ID_LENGTH = 50
+
+# Characters allowed in level/phase IDs
+_ID_ALLOWED = frozenset(string.ascii_letters + string.digits + "_-")
+
+
+# Error details for rejected IDs; the detail never includes the value
+_INVALID_ID_DETAILS = {
+    name: f"Invalid {name}: must contain only alphanumeric characters, underscores, and hyphens"
+    for name in ("level_id", "phase_id")
+}
 
 
 def _validate_id(value: str, name: str) -> None:
-    """Validate that an ID contains only safe characters."""
-    if not VALID_ID_PATTERN.match(value):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid {name}: must contain only alphanumeric characters, underscores, and hyphens",
-        )
+    """Validate that an ID contains only ASCII alphanumerics, underscores and hyphens."""
+    if not (0 < len(value) <= MAX_ID_LENGTH and _ID_ALLOWED.issuperset(value)):
+        raise HTTPException(status_code=400, detail=_INVALID_ID_DETAILS[name])
 
 
 def _validate_mode(mode: str) -> None:
@@ -52,24 +78,27 @@ def _validate_mode(mode: str) -> None:
 
 
 def _get_curriculum_file(mode: str) -> Path:
-    """Get the curriculum JSON file path for a given mode."""
-    return CONTENT_DIR / f"curriculum-{mode}.json"
+    """Get the curriculum JSON file path for a given (validated) mode."""
+    return _CURRICULUM_PATHS[mode]
 
 
 def _validate_content_path(content_file: str) -> Path:
     """
-    Validate and resolve a content file path safely.
+    Validate and build a content file path safely.
 
-    Prevents path traversal attacks by ensuring the resolved path
-    stays within CONTENT_DIR.
+    Prevents path traversal attacks by rejecting absolute paths,
+    backslashes and '..' segments, then checking that the joined path
+    stays within CONTENT_DIR. Uses string checks only (no resolve()).
     """
-    # Build the full path
-    full_path = (CONTENT_DIR / content_file).resolve()
-
-    # Ensure it's within CONTENT_DIR (prevent path traversal)
-    try:
-        full_path.relative_to(CONTENT_DIR.resolve())
-    except ValueError:
+    full_path = _CONTENT_DIR_RESOLVED / content_file
+
+    if (
+        not content_file
+        or content_file.startswith("/")
+        or "\\" in content_file
+        or ".." in content_file.split("/")
+        or not str(full_path).startswith(_CONTENT_DIR_PREFIX)
+    ):
         logger.warning(f"Path traversal attempt detected: {content_file}")
         raise HTTPException(
             status_code=400,
@@ -79,93 +108,265 @@ def _validate_content_path(content_file: str) -> Path:
     return full_path
 
 
-@lru_cache(maxsize=3)
-def _load_curriculum_cached(mode: str) -> str:
-    """Load curriculum JSON as string (cached for lru_cache compatibility)."""
+def _parse_level(level_data: dict) -> Level:
+    """Parse a level dict into a Level model."""
+    phases = [
+        Phase(**phase_data)
+        for phase_data in level_data.get("phases", [])
+    ]
+    return Level(
+        id=level_data["id"],
+        title=level_data["title"],
+        subtitle=level_data["subtitle"],
+        description=level_data["description"],
+        mana_color=level_data["mana_color"],
+        phases=phases,
+        locked=level_data.get("locked", False),
+    )
+
+
+class _JsonPayload(NamedTuple):
+    """A pre-encoded JSON response body and its ETag."""
+
+    body: bytes
+    etag: str
+
+
+def _encode_payload(model: BaseModel) -> _JsonPayload:
+    """Serialize a model once and derive a strong ETag from the bytes."""
+    body = orjson.dumps(model.model_dump())
+    return _JsonPayload(
+        body=body,
+        etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+    )
+
+
+class _Curriculum(NamedTuple):
+    """A parsed curriculum with lookup indexes built once at load."""
+
+    response: CurriculumResponse
+    response_json: _JsonPayload
+    levels_by_id: Mapping[str, Level]
+    level_json: Mapping[str, _JsonPayload]
+    phases_by_id: Mapping[tuple[str, str], Phase]
+    content_paths: Mapping[str, Path]
+    """Validated file path for each phase's content_file (unsafe entries omitted)."""
+    phase_json: dict[tuple[str, str], tuple[int, _JsonPayload]]
+    """Encoded phase content responses with their file's mtime_ns, filled on first request."""
+
+
+@cache
+def _load_curriculum(mode: str = "mtg") -> _Curriculum:
+    """
+    Load, parse and index the curriculum JSON file (cached per mode).
+
+    The Level/Phase models are built once here and shared by every
+    request, so the models are frozen and the indexes are read-only
+    views; call ``_load_curriculum.cache_clear()`` to reload.
+    """
     curriculum_file = _get_curriculum_file(mode)
 
-    if not curriculum_file.exists():
+    try:
+        data = orjson.loads(curriculum_file.read_bytes())
+    except FileNotFoundError:
         raise HTTPException(
             status_code=500,
             detail=f"Curriculum configuration not found for mode: {mode}",
         )
-
-    try:
-        return curriculum_file.read_text(encoding="utf-8")
     except IOError as e:
         logger.error(f"Failed to read curriculum-{mode}.json: {e}")
         raise HTTPException(
             status_code=500,
             detail="Failed to load curriculum configuration",
         )
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Failed to parse curriculum-{mode}.json: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Invalid curriculum configuration",
+        )
 
-
-def _load_curriculum(mode: str = "mtg") -> dict:
-    """Load and parse the curriculum JSON file (with caching)."""
     try:
-        return json.loads(_load_curriculum_cached(mode))
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse curriculum-{mode}.json: {e}")
+        levels = [_parse_level(level_data) for level_data in data.get("levels", [])]
+        response = CurriculumResponse(levels=levels)
+    except (AttributeError, KeyError, TypeError, ValidationError) as e:
+        logger.error(f"Invalid structure in curriculum-{mode}.json: {e!r}")
         raise HTTPException(
             status_code=500,
             detail="Invalid curriculum configuration",
         )
+    phases_by_id = {
+        (level.id, phase.id): phase
+        for level in levels
+        for phase in level.phases
+    }
+
+    # The set of readable files is fixed by the curriculum, so validate each
+    # path once here; requests then only need a dict lookup
+    content_paths = {}
+    for phase in phases_by_id.values():
+        try:
+            content_paths[phase.content_file] = _validate_content_path(phase.content_file)
+        except HTTPException:
+            pass  # Logged by _validate_content_path; requests for it get a 400
+
+    return _Curriculum(
+        response=response,
+        response_json=_encode_payload(response),
+        levels_by_id=MappingProxyType({level.id: level for level in levels}),
+        level_json=MappingProxyType(
+            {level.id: _encode_payload(level) for level in levels}
+        ),
+        phases_by_id=MappingProxyType(phases_by_id),
+        content_paths=MappingProxyType(content_paths),
+        phase_json={},
+    )
 
 
-def _parse_level(level_data: dict) -> Level:
-    """Parse a level dict into a Level model."""
-    phases = [
-        Phase(**phase_data)
-        for phase_data in level_data.get("phases", [])
-    ]
-    return Level(
-        id=level_data["id"],
-        title=level_data["title"],
-        subtitle=level_data["subtitle"],
-        description=level_data["description"],
-        mana_color=level_data["mana_color"],
-        phases=phases,
-        locked=level_data.get("locked", False),
+def _stat_content(curriculum: _Curriculum, content_file: str) -> tuple[Path, int]:
+    """Look up a phase's validated content path and return it with its mtime_ns."""
+    path = curriculum.content_paths.get(content_file)
+    if path is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid content path",
+        )
+
+    try:
+        return path, path.stat().st_mtime_ns
+    except FileNotFoundError:
+        logger.error(f"Content file not found: {path}")
+        raise HTTPException(
+            status_code=500,
+            detail="Phase content not available",
+        )
+    except IOError as e:
+        logger.error(f"Failed to stat content file: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load phase content",
+        )
+
+
+@lru_cache(maxsize=256)
+def _read_content(path_str: str, mtime_ns: int) -> str:
+    """
+    Read a phase's markdown file (cached).
+
+    Keyed on the file's mtime_ns, so editing a file busts its entry.
+    """
+    try:
+        # read_bytes() skips the text-mode wrapper; decode the UTF-8 in one step
+        return Path(path_str).read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"Failed to read content file: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load phase content",
+        )
+
+
+def preload_content() -> None:
+    """
+    Load every curriculum and its markdown files into memory.
+
+    Called once at application startup. Files that fail to load are
+    skipped here and read on demand instead, so bad content never stops
+    the app from starting.
+    """
+    start = time.perf_counter()
+    files = 0
+    for mode in VALID_MODES:
+        try:
+            curriculum = _load_curriculum(mode)
+        except HTTPException:
+            logger.warning(f"Could not preload curriculum: {mode}")
+            continue
+        except Exception:
+            logger.exception(f"Could not preload curriculum: {mode}")
+            continue
+        for phase in curriculum.phases_by_id.values():
+            try:
+                path, mtime_ns = _stat_content(curriculum, phase.content_file)
+                _read_content(str(path), mtime_ns)
+                files += 1
+            except HTTPException:
+                logger.warning(f"Could not preload content: {phase.content_file}")
+            except Exception:
+                logger.exception(f"Could not preload content: {phase.content_file}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"Preloaded {files} content files in {elapsed_ms:.1f} ms")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _cached_json_response(request: Request, payload: _JsonPayload) -> Response:
+    """
+    Serve a pre-encoded payload with HTTP caching headers.
+
+    Returns 304 Not Modified (no body) when the client already holds
+    the current version.
+    """
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": payload.etag}
+
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=payload.body,
+        media_type="application/json",
+        headers=headers,
     )
 
 
 @router.get("/curriculum", response_model=CurriculumResponse)
 async def get_curriculum(
+    request: Request,
     mode: str = Query(default="mtg", description="Learning mode"),
-) -> CurriculumResponse:
+) -> Response:
     """
     Get the full curriculum structure.
 
     Returns all levels and their phases (without content).
+    Supports conditional GET via ETag/If-None-Match.
     """
     _validate_mode(mode)
-    data = _load_curriculum(mode)
-    levels = [_parse_level(level_data) for level_data in data.get("levels", [])]
-    return CurriculumResponse(levels=levels)
+    return _cached_json_response(request, _load_curriculum(mode).response_json)
 
 
 @router.get("/levels/{level_id}", response_model=Level)
 async def get_level(
-    level_id: str = PathParam(..., min_length=1, max_length=50),
+    request: Request,
+    level_id: str = PathParam(..., min_length=1, max_length=MAX_ID_LENGTH),
     mode: str = Query(default="mtg", description="Learning mode"),
-) -> Level:
+) -> Response:
     """
     Get a specific level by ID.
 
     Returns the level structure with all phases (without content).
+    Supports conditional GET via ETag/If-None-Match.
     """
     _validate_mode(mode)
     _validate_id(level_id, "level_id")
-    data = _load_curriculum(mode)
+    payload = _load_curriculum(mode).level_json.get(level_id)
 
-    for level_data in data.get("levels", []):
-        if level_data["id"] == level_id:
-            return _parse_level(level_data)
+    if payload is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Level '{level_id}' not found in the archives",
+        )
 
-    raise HTTPException(
-        status_code=404,
-        detail=f"Level '{level_id}' not found in the archives",
-    )
+    return _cached_json_response(request, payload)
 
 
 @router.get(
@@ -173,69 +374,50 @@ async def get_level(
     response_model=PhaseContentResponse,
 )
 async def get_phase_content(
-    level_id: str = PathParam(..., min_length=1, max_length=50),
-    phase_id: str = PathParam(..., min_length=1, max_length=50),
+    request: Request,
+    level_id: str = PathParam(..., min_length=1, max_length=MAX_ID_LENGTH),
+    phase_id: str = PathParam(..., min_length=1, max_length=MAX_ID_LENGTH),
     mode: str = Query(default="mtg", description="Learning mode"),
-) -> PhaseContentResponse:
+) -> Response:
     """
     Get the content for a specific phase.
 
     Returns the markdown content for the tutorial/lesson.
+    Supports conditional GET via ETag/If-None-Match.
     """
     _validate_mode(mode)
     _validate_id(level_id, "level_id")
     _validate_id(phase_id, "phase_id")
 
-    data = _load_curriculum(mode)
-
-    # Find the level
-    level_data: Optional[dict] = None
-    for lvl in data.get("levels", []):
-        if lvl["id"] == level_id:
-            level_data = lvl
-            break
-
-    if not level_data:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Level '{level_id}' not found in the archives",
-        )
-
-    # Find the phase
-    phase_data: Optional[dict] = None
-    for phase in level_data.get("phases", []):
-        if phase["id"] == phase_id:
-            phase_data = phase
-            break
+    curriculum = _load_curriculum(mode)
+    phase = curriculum.phases_by_id.get((level_id, phase_id))
 
-    if not phase_data:
+    if phase is None:
+        # Only distinguish a missing level from a missing phase on the error path
+        if level_id not in curriculum.levels_by_id:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Level '{level_id}' not found in the archives",
+            )
         raise HTTPException(
             status_code=404,
             detail=f"Phase '{phase_id}' not found in level '{level_id}'",
         )
 
-    # Validate and load the content file
-    content_file = _validate_content_path(phase_data["content_file"])
-
-    if not content_file.exists():
-        logger.error(f"Content file not found: {content_file}")
-        raise HTTPException(
-            status_code=500,
-            detail="Phase content not available",
-        )
-
-    try:
-        content = content_file.read_text(encoding="utf-8")
-    except IOError as e:
-        logger.error(f"Failed to read content file: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to load phase content",
-        )
-
-    return PhaseContentResponse(
-        level_id=level_id,
-        phase_id=phase_id,
-        title=phase_data["title"],
-        content=content,
-    )
+    path, mtime_ns = _stat_content(curriculum, phase.content_file)
+    cached = curriculum.phase_json.get((level_id, phase_id))
+
+    if cached is not None and cached[0] == mtime_ns:
+        payload = cached[1]
+    else:
+        # New or modified file: read in the threadpool, not on the event loop
+        content = await run_in_threadpool(_read_content, str(path), mtime_ns)
+        payload = _encode_payload(PhaseContentResponse(
+            level_id=level_id,
+            phase_id=phase_id,
+            title=phase.title,
+            content=content,
+        ))
+        curriculum.phase_json[(level_id, phase_id)] = (mtime_ns, payload)
+
+    return _cached_json_response(request, payload)
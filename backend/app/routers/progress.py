@@ -6,6 +6,7 @@ and managing user learning mode preferences.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from app.models.schemas import (
     VALID_MODES,
@@ -21,11 +22,11 @@ router = APIRouter()
 
 
 @router.get("/progress/{user_id}", response_model=ProgressResponse)
-def get_progress(
+async def get_progress(
     user_id: str,
     mode: str = Query(default="mtg", description="Learning mode filter"),
     db: DatabaseService = Depends(get_database),
-) -> ProgressResponse:
+) -> ORJSONResponse:
     """
     Retrieve a user's journey progress, filtered by learning mode.
     """
@@ -33,14 +34,17 @@ def get_progress(
         raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}. Must be one of {VALID_MODES}")
 
     try:
-        progress = db.get_progress(user_id, mode=mode)
-        return ProgressResponse(user_id=user_id, progress=progress)
+        progress = await db.get_progress(user_id, mode=mode)
+        # Returned directly to skip FastAPI re-validating the response model
+        return ORJSONResponse(
+            content=ProgressResponse(user_id=user_id, progress=progress).model_dump()
+        )
     except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/progress/{user_id}", response_model=ProgressUpdateResponse)
-def update_progress(
+async def update_progress(
     user_id: str,
     update: ProgressUpdate,
     db: DatabaseService = Depends(get_database),
@@ -49,7 +53,7 @@ def update_progress(
     Record a user's progress through a phase.
     """
     try:
-        db.upsert_progress(
+        await db.upsert_progress(
             user_id=user_id,
             level_id=update.level_id,
             phase_id=update.phase_id,
@@ -67,24 +71,24 @@ def update_progress(
 
 
 @router.get("/preferences/{user_id}", response_model=UserPreference)
-def get_preference(
+async def get_preference(
     user_id: str,
     db: DatabaseService = Depends(get_database),
 ) -> UserPreference:
     """Get a user's learning mode preference."""
-    active_mode = db.get_user_preference(user_id)
+    active_mode = await db.get_user_preference(user_id)
     return UserPreference(user_id=user_id, active_mode=active_mode)
 
 
 @router.put("/preferences/{user_id}", response_model=UserPreference)
-def set_preference(
+async def set_preference(
     user_id: str,
     update: UserPreferenceUpdate,
     db: DatabaseService = Depends(get_database),
 ) -> UserPreference:
     """Set a user's learning mode preference."""
     try:
-        db.set_user_preference(user_id, update.active_mode)
+        await db.set_user_preference(user_id, update.active_mode)
         return UserPreference(user_id=user_id, active_mode=update.active_mode)
     except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -5,11 +5,11 @@ Endpoints for managing saved code snippets.
 """
 
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from app.models.schemas import (
     SnippetCreate,
-    SnippetResponse,
     SnippetListResponse,
     SnippetCreateResponse,
     SnippetDeleteResponse,
@@ -20,40 +20,44 @@ router = APIRouter()
 
 
 @router.get("/snippets/{user_id}", response_model=SnippetListResponse)
-def get_snippets(
+async def get_snippets(
     user_id: str,
     level_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum snippets to return"),
+    offset: int = Query(0, ge=0, description="Snippets to skip (newest first)"),
     db: DatabaseService = Depends(get_database),
-) -> SnippetListResponse:
+) -> ORJSONResponse:
     """
-    Retrieve a Planeswalker's saved Decklists.
+    Retrieve a Planeswalker's saved Decklists, newest first.
 
-    Optionally filter by level_id.
+    Optionally filter by level_id. Paginate with limit/offset.
 
     TODO: Add authentication middleware to verify user_id matches authenticated user.
     """
     try:
-        snippets = db.get_snippets(user_id, level_id)
-        return SnippetListResponse(
-            snippets=[
-                SnippetResponse(
-                    id=s["id"],
-                    level_id=s["level_id"],
-                    title=s["title"],
-                    code=s["code"],
-                    is_valid=s["is_valid"],
-                    validation_result=s.get("validation_result"),
-                    created_at=s.get("created_at"),
-                )
+        snippets = await db.get_snippets(user_id, level_id, limit=limit, offset=offset)
+        # Rows are already plain JSON types, so project them straight into the
+        # SnippetListResponse shape instead of building a model per row
+        return ORJSONResponse(content={
+            "snippets": [
+                {
+                    "id": s["id"],
+                    "level_id": s["level_id"],
+                    "title": s["title"],
+                    "code": s["code"],
+                    "is_valid": s["is_valid"],
+                    "validation_result": s.get("validation_result"),
+                    "created_at": s.get("created_at"),
+                }
                 for s in snippets
             ]
-        )
+        })
     except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/snippets/{user_id}", response_model=SnippetCreateResponse)
-def create_snippet(
+async def create_snippet(
     user_id: str,
     snippet: SnippetCreate,
     db: DatabaseService = Depends(get_database),
@@ -64,13 +68,17 @@ def create_snippet(
     TODO: Add authentication middleware to verify user_id matches authenticated user.
     """
     try:
-        snippet_id = db.save_snippet(
+        snippet_id = await db.save_snippet(
             user_id=user_id,
             level_id=snippet.level_id,
             title=snippet.title,
             code=snippet.code,
             is_valid=snippet.is_valid,
-            validation_result=snippet.validation_result,
+            validation_result=(
+                snippet.validation_result.model_dump(mode="json")
+                if snippet.validation_result
+                else None
+            ),
         )
 
         return SnippetCreateResponse(
@@ -82,7 +90,7 @@ def create_snippet(
 
 
 @router.delete("/snippets/{user_id}/{snippet_id}", response_model=SnippetDeleteResponse)
-def delete_snippet(
+async def delete_snippet(
     user_id: str,
     snippet_id: str,
     db: DatabaseService = Depends(get_database),
@@ -93,7 +101,7 @@ def delete_snippet(
     TODO: Add authentication middleware to verify user_id matches authenticated user.
     """
     try:
-        deleted = db.delete_snippet(user_id, snippet_id)
+        deleted = await db.delete_snippet(user_id, snippet_id)
 
         if not deleted:
             raise HTTPException(status_code=404, detail="Decklist not found")
@@ -14,9 +14,121 @@ that MCP server code follows the correct patterns:
 """
 
 import ast
+import hashlib
+import inspect
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Optional
-from app.models.schemas import ValidationError, ValidationResponse
+from app.models.schemas import MAX_CODE_LENGTH, ValidationError, ValidationResponse
+
+# Node types _scan_tree acts on; everything else is skipped with one lookup
+_SCANNED_NODE_TYPES = frozenset({
+    ast.Import,
+    ast.ImportFrom,
+    ast.Assign,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.Try,
+})
+
+# Decorator attributes that register an MCP component (@<var>.tool, ...)
+_DECORATOR_ATTRS = frozenset({"tool", "resource", "prompt"})
+
+# Server variable names accepted even if no FastMCP assignment was found
+_MCP_NAMES = frozenset({"mcp", "server", "app"})
+
+# Attribute names treated as HTTP calls in a tool body (client.get(...), ...)
+_HTTP_METHOD_ATTRS = frozenset({"get", "post", "put", "delete", "request"})
+
+# Parameters in a resource URI template, e.g. "archive://{category}/{name}"
+_URI_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+# Level 5 multi-agent heuristics, each a single alternation of the patterns
+_STATE_MANAGEMENT_RE = re.compile(r"@dataclass|class.*State:|pipeline_state|state =")
+_SEQUENTIAL_EXECUTION_RE = re.compile(r"await.*step|state = await")
+
+
+# Parsed trees kept for resubmitted code. A tree takes 40-110x the memory of
+# its source, so only realistic exercise-sized sources are cached and the
+# cached sources are capped at 128K characters in total (~15 MB of trees)
+_PARSE_CACHE_SIZE = 32
+_PARSE_CACHE_MAX_SOURCE = 16_384
+_PARSE_CACHE_MAX_CHARS = 131_072
+# sha256 digest -> (tree or syntax error, source length)
+_parse_cache: OrderedDict[bytes, tuple[ast.Module | SyntaxError, int]] = OrderedDict()
+_parse_cache_chars = 0
+_parse_cache_lock = threading.Lock()
+
+
+def _compile(code: str) -> ast.Module | SyntaxError:
+    """Parse source code, returning the syntax error instead of raising it."""
+    try:
+        # Same as ast.parse(), minus its wrapper
+        return compile(code, "<unknown>", "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError as e:
+        return e.with_traceback(None)
+
+
+def _parse(code: str) -> ast.Module | SyntaxError:
+    """
+    Parse source code, caching the tree (or the syntax error) for small sources.
+
+    Students often resubmit unchanged code while working through a phase.
+    The validator only reads the tree, so cached trees are safe to share.
+    Entries are keyed on the source's sha256 digest so the cache does not
+    also hold the source; sources over _PARSE_CACHE_MAX_SOURCE characters
+    are parsed every time, and the total cached source size is capped.
+    """
+    global _parse_cache_chars
+
+    size = len(code)
+    if size > _PARSE_CACHE_MAX_SOURCE:
+        return _compile(code)
+
+    key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).digest()
+    with _parse_cache_lock:
+        entry = _parse_cache.get(key)
+        if entry is not None:
+            _parse_cache.move_to_end(key)
+            return entry[0]
+
+    tree = _compile(code)
+    with _parse_cache_lock:
+        if key not in _parse_cache:
+            _parse_cache[key] = (tree, size)
+            _parse_cache_chars += size
+        while (
+            len(_parse_cache) > _PARSE_CACHE_SIZE
+            or _parse_cache_chars > _PARSE_CACHE_MAX_CHARS
+        ):
+            _parse_cache_chars -= _parse_cache.popitem(last=False)[1][1]
+    return tree
+
+
+def _get_docstring(node: ast.FunctionDef | ast.AsyncFunctionDef) -> Optional[str]:
+    """
+    Return a function's cleaned docstring, same as ast.get_docstring().
+
+    A one-line docstring only needs its leading whitespace stripped, so
+    inspect.cleandoc (split, dedent, rejoin) is skipped for those.
+    """
+    first = node.body[0]
+    if not (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    ):
+        return None
+
+    text = first.value.value
+    if "\n" not in text and "\t" not in text:
+        return text.lstrip()
+    return inspect.cleandoc(text)
 
 
 class MCPValidator:
@@ -32,6 +144,26 @@ class MCPValidator:
     - Level-specific requirements (async, httpx, caching, security)
     """
 
+    __slots__ = (
+        "level",
+        "errors",
+        "warnings",
+        "tools_found",
+        "resources_found",
+        "prompts_found",
+        "has_fastmcp_import",
+        "has_mcp_instance",
+        "has_httpx_import",
+        "has_async_client",
+        "has_caching",
+        "has_path_validation",
+        "has_async_def",
+        "has_async_tool",
+        "has_template_resource",
+        "has_try_except",
+        "mcp_var_name",
+    )
+
     def __init__(self, level: Optional[str] = None):
         """
         Initialize the validator.
@@ -40,6 +172,10 @@ class MCPValidator:
             level: Optional level identifier for level-specific validation
                    (e.g., "level2", "level3", "level4")
         """
+        self._reset(level)
+
+    def _reset(self, level: Optional[str]) -> None:
+        """Clear all per-validation state and set the level to validate for."""
         self.level = level
         self.errors: list[ValidationError] = []
         self.warnings: list[ValidationError] = []
@@ -52,6 +188,10 @@ class MCPValidator:
         self.has_async_client = False
         self.has_caching = False
         self.has_path_validation = False
+        self.has_async_def = False
+        self.has_async_tool = False
+        self.has_template_resource = False
+        self.has_try_except = False
         self.mcp_var_name: Optional[str] = None
 
     def validate(self, code: str, level: Optional[str] = None) -> ValidationResponse:
@@ -65,115 +205,160 @@ class MCPValidator:
         Returns:
             ValidationResponse with validity status and any errors found
         """
-        # Reset state
-        self.level = level or self.level
-        self.errors = []
-        self.warnings = []
-        self.tools_found = []
-        self.resources_found = []
-        self.prompts_found = []
-        self.has_fastmcp_import = False
-        self.has_mcp_instance = False
-        self.has_httpx_import = False
-        self.has_async_client = False
-        self.has_caching = False
-        self.has_path_validation = False
-        self.mcp_var_name = None
+        self._reset(level or self.level)
+
+        # The API enforces this limit too; validate_code/validate_batch callers may not
+        if len(code) > MAX_CODE_LENGTH:
+            self._add_error(
+                error_type="code_too_large",
+                line=1,
+                message=f"Your Decklist is too vast for the Inspector! "
+                        f"Keep it to {MAX_CODE_LENGTH:,} characters or fewer."
+            )
+            return self._build_response()
 
         # Try to parse the code
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
-            self.errors.append(ValidationError(
-                type="syntax_error",
-                line=e.lineno,
-                message=f"Your spell contains forbidden runes! Syntax error: {e.msg}"
-            ))
+        tree = _parse(code)
+        if isinstance(tree, SyntaxError):
+            self._add_error(
+                error_type="syntax_error",
+                line=tree.lineno,
+                message=f"Your spell contains forbidden runes! Syntax error: {tree.msg}"
+            )
             return self._build_response()
 
-        # Walk the AST and validate
-        self._check_imports(tree)
-        self._check_mcp_instance(tree)
-        self._check_decorated_functions(tree)
-        self._check_level_specific(tree, code)
+        # Walk the AST once, then validate what it found
+        decorated = self._scan_tree(tree)
+        self._check_decorated_functions(decorated)
+        self._check_level_specific(code)
 
         # Check for missing essentials
         if not self.has_fastmcp_import:
-            self.errors.append(ValidationError(
-                type="missing_import",
+            self._add_error(
+                error_type="missing_import",
                 line=1,
                 message="Your Decklist lacks the essential fastmcp import! "
                         "Add: from fastmcp import FastMCP"
-            ))
+            )
 
         if not self.has_mcp_instance and self.has_fastmcp_import:
-            self.errors.append(ValidationError(
-                type="missing_instance",
+            self._add_error(
+                error_type="missing_instance",
                 line=1,
                 message="You've imported the Library but haven't instantiated it! "
                         "Add: mcp = FastMCP('your-server-name')"
-            ))
+            )
 
         if self.has_mcp_instance and not self.tools_found and not self.resources_found:
-            self.errors.append(ValidationError(
-                type="empty_deck",
+            self._add_error(
+                error_type="empty_deck",
                 line=1,
                 message="Your Deck is empty, Planeswalker! Add at least one Sorcery "
                         "(@mcp.tool) or Permanent (@mcp.resource)."
-            ))
+            )
 
         return self._build_response()
 
-    def _check_imports(self, tree: ast.AST) -> None:
-        """Check for required imports."""
+    def _add_error(self, error_type: str, line: Optional[int], message: str) -> None:
+        """Record an error (our own values, so built without validation)."""
+        self.errors.append(ValidationError.model_construct(
+            type=error_type, line=line, message=message
+        ))
+
+    def _add_warning(self, error_type: str, line: Optional[int], message: str) -> None:
+        """Record a warning (our own values, so built without validation)."""
+        self.warnings.append(ValidationError.model_construct(
+            type=error_type, line=line, message=message
+        ))
+
+    def _scan_tree(self, tree: ast.AST) -> list[ast.FunctionDef | ast.AsyncFunctionDef]:
+        """
+        Collect everything the checks need in a single walk of the tree.
+
+        Records imports, the FastMCP instance and try/except usage, and
+        returns the decorated function definitions in walk order. Their
+        decorators are classified afterwards, once the mcp variable name
+        is final (the FastMCP assignment may come after the functions).
+        """
+        decorated = []
         for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
+            node_type = type(node)
+            if node_type not in _SCANNED_NODE_TYPES:
+                continue
+
+            if node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                if node.decorator_list:
+                    decorated.append(node)
+                if node_type is ast.AsyncFunctionDef:
+                    self.has_async_def = True
+            elif node_type is ast.ImportFrom:
                 if node.module == "fastmcp":
                     for alias in node.names:
                         if alias.name == "FastMCP":
                             self.has_fastmcp_import = True
                 elif node.module == "httpx" or (node.module and "httpx" in node.module):
                     self.has_httpx_import = True
-            elif isinstance(node, ast.Import):
+            elif node_type is ast.Import:
                 for alias in node.names:
                     if alias.name == "fastmcp":
                         self.has_fastmcp_import = True
                     elif alias.name == "httpx":
                         self.has_httpx_import = True
-
-    def _check_mcp_instance(self, tree: ast.AST) -> None:
-        """Check for FastMCP instantiation."""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                if isinstance(node.value, ast.Call):
-                    func = node.value.func
-                    if isinstance(func, ast.Name) and func.id == "FastMCP":
-                        self.has_mcp_instance = True
-                        if node.targets and isinstance(node.targets[0], ast.Name):
-                            self.mcp_var_name = node.targets[0].id
-                    elif isinstance(func, ast.Attribute) and func.attr == "FastMCP":
-                        self.has_mcp_instance = True
-                        if node.targets and isinstance(node.targets[0], ast.Name):
-                            self.mcp_var_name = node.targets[0].id
-
-    def _check_decorated_functions(self, tree: ast.AST) -> None:
+            elif node_type is ast.Assign:
+                self._check_mcp_instance(node)
+            elif node_type is ast.Try:
+                self.has_try_except = True
+
+        return decorated
+
+    def _check_mcp_instance(self, node: ast.Assign) -> None:
+        """Check an assignment for FastMCP instantiation."""
+        if isinstance(node.value, ast.Call):
+            func = node.value.func
+            if (
+                (isinstance(func, ast.Name) and func.id == "FastMCP")
+                or (isinstance(func, ast.Attribute) and func.attr == "FastMCP")
+            ):
+                self.has_mcp_instance = True
+                if node.targets and isinstance(node.targets[0], ast.Name):
+                    self.mcp_var_name = node.targets[0].id
+
+    def _check_decorated_functions(
+        self,
+        functions: list[ast.FunctionDef | ast.AsyncFunctionDef]
+    ) -> None:
         """Check for @mcp.tool, @mcp.resource, @mcp.prompt decorated functions."""
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                for decorator in node.decorator_list:
-                    decorator_type = self._get_decorator_type(decorator)
-
-                    if decorator_type == "tool":
-                        self.tools_found.append(node.name)
-                        self._validate_tool(node)
-                    elif decorator_type == "resource":
-                        self.resources_found.append(node.name)
-                        self._validate_resource(node, decorator)
-                    elif decorator_type == "prompt":
-                        self.prompts_found.append(node.name)
-
-    def _get_decorator_type(self, decorator: ast.expr) -> Optional[str]:
-        """Determine if decorator is mcp.tool, mcp.resource, or mcp.prompt."""
+        if self.mcp_var_name:
+            owners = _MCP_NAMES | {self.mcp_var_name}
+        else:
+            owners = _MCP_NAMES
+
+        for node in functions:
+            for decorator in node.decorator_list:
+                decorator_type = self._get_decorator_type(decorator, owners)
+
+                if decorator_type == "tool":
+                    self.tools_found.append(node.name)
+                    if isinstance(node, ast.AsyncFunctionDef):
+                        self.has_async_tool = True
+                    self._validate_tool(node)
+                elif decorator_type == "resource":
+                    self.resources_found.append(node.name)
+                    self._validate_resource(node, decorator)
+                elif decorator_type == "prompt":
+                    self.prompts_found.append(node.name)
+
+    def _get_decorator_type(
+        self,
+        decorator: ast.expr,
+        owners: frozenset[str]
+    ) -> Optional[str]:
+        """
+        Determine if decorator is mcp.tool, mcp.resource, or mcp.prompt.
+
+        ``owners`` holds the accepted server variable names: the FastMCP
+        instance's name plus common names like 'mcp', 'server', 'app'.
+        """
         # Handle @mcp.tool() or @mcp.tool
         if isinstance(decorator, ast.Call):
             func = decorator.func
@@ -182,49 +367,44 @@ class MCPValidator:
 
         if isinstance(func, ast.Attribute):
             # Check if it's <var>.tool, <var>.resource, or <var>.prompt
-            if func.attr in ("tool", "resource", "prompt"):
+            if func.attr in _DECORATOR_ATTRS:
                 # Verify the object is our mcp instance
-                if isinstance(func.value, ast.Name):
-                    if self.mcp_var_name and func.value.id == self.mcp_var_name:
-                        return func.attr
-                    # Also accept common names like 'mcp', 'server', 'app'
-                    if func.value.id in ("mcp", "server", "app"):
-                        return func.attr
+                if isinstance(func.value, ast.Name) and func.value.id in owners:
+                    return func.attr
         return None
 
     def _validate_tool(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
         """Validate a @mcp.tool decorated function."""
         # Check for docstring (Oracle Text)
-        docstring = ast.get_docstring(node)
+        docstring = _get_docstring(node)
         if not docstring:
-            self.errors.append(ValidationError(
-                type="missing_docstring",
+            self._add_error(
+                error_type="missing_docstring",
                 line=node.lineno,
                 message=f"Your Sorcery '{node.name}' lacks Oracle Text! "
                         f"Add a docstring to help the Planeswalker understand its purpose."
-            ))
+            )
         elif len(docstring) < 10:
-            self.errors.append(ValidationError(
-                type="short_docstring",
+            self._add_error(
+                error_type="short_docstring",
                 line=node.lineno,
                 message=f"The Oracle Text for '{node.name}' is too brief! "
                         f"Provide more detail about what this Sorcery does."
-            ))
+            )
 
         # Level 3+: Check for async when using HTTP calls
         if self.level in ("level3", "level4"):
-            if not isinstance(node, ast.AsyncFunctionDef):
-                # Check if function uses httpx
-                for subnode in ast.walk(node):
-                    if isinstance(subnode, ast.Attribute):
-                        if subnode.attr in ("get", "post", "put", "delete", "request"):
-                            self.warnings.append(ValidationError(
-                                type="sync_http_call",
-                                line=node.lineno,
-                                message=f"Your Sorcery '{node.name}' uses HTTP calls but is not async! "
-                                        f"Consider using 'async def' for non-blocking I/O."
-                            ))
-                            break
+            # Check if function uses httpx (only sync tools' subtrees are walked)
+            if not isinstance(node, ast.AsyncFunctionDef) and any(
+                type(subnode) is ast.Attribute and subnode.attr in _HTTP_METHOD_ATTRS
+                for subnode in ast.walk(node)
+            ):
+                self._add_warning(
+                    error_type="sync_http_call",
+                    line=node.lineno,
+                    message=f"Your Sorcery '{node.name}' uses HTTP calls but is not async! "
+                            f"Consider using 'async def' for non-blocking I/O."
+                )
 
     def _validate_resource(
         self,
@@ -235,106 +415,87 @@ class MCPValidator:
         # Check that resource has a URI argument
         if isinstance(decorator, ast.Call) and decorator.args:
             uri_arg = decorator.args[0]
-            if isinstance(uri_arg, ast.Constant) and isinstance(uri_arg.value, str):
-                uri = uri_arg.value
+            uri = uri_arg.value if isinstance(uri_arg, ast.Constant) else None
+            if isinstance(uri, str):
+                if "{" in uri:
+                    self.has_template_resource = True
                 if "://" not in uri:
-                    self.errors.append(ValidationError(
-                        type="invalid_resource_uri",
+                    self._add_error(
+                        error_type="invalid_resource_uri",
                         line=node.lineno,
                         message=f"Your Permanent '{node.name}' has an invalid URI! "
                                 f"URIs must follow protocol://path format."
-                    ))
+                    )
                 # Check for URI template parameters
                 if "{" in uri and "}" in uri:
                     # Verify function has matching parameters
-                    template_params = re.findall(r'\{(\w+)\}', uri)
-                    func_params = [arg.arg for arg in node.args.args]
+                    template_params = _URI_PARAM_RE.findall(uri)
+                    func_params = {arg.arg for arg in node.args.args}
                     for param in template_params:
                         if param not in func_params:
-                            self.errors.append(ValidationError(
-                                type="uri_param_mismatch",
+                            self._add_error(
+                                error_type="uri_param_mismatch",
                                 line=node.lineno,
                                 message=f"URI template parameter '{{{param}}}' has no matching "
                                         f"function parameter in '{node.name}'."
-                            ))
+                            )
         else:
-            self.errors.append(ValidationError(
-                type="missing_resource_uri",
+            self._add_error(
+                error_type="missing_resource_uri",
                 line=node.lineno,
                 message=f"Your Permanent '{node.name}' needs a URI! "
                         f"Add a URI like @mcp.resource('file://path/to/resource')"
-            ))
+            )
 
         # Check for docstring on resources too
-        docstring = ast.get_docstring(node)
+        docstring = _get_docstring(node)
         if not docstring:
-            self.warnings.append(ValidationError(
-                type="missing_resource_docstring",
+            self._add_warning(
+                error_type="missing_resource_docstring",
                 line=node.lineno,
                 message=f"Your Permanent '{node.name}' lacks Oracle Text! "
                         f"Consider adding a docstring for discoverability."
-            ))
+            )
 
-    def _check_level_specific(self, tree: ast.AST, code: str) -> None:
+    def _check_level_specific(self, code: str) -> None:
         """Check level-specific requirements."""
-        if self.level == "level2":
-            self._check_level2_requirements(tree, code)
-        elif self.level == "level3":
-            self._check_level3_requirements(tree, code)
-        elif self.level == "level4":
-            self._check_level4_requirements(tree, code)
-        elif self.level == "level5":
-            self._check_level5_requirements(tree, code)
-
-    def _check_level2_requirements(self, tree: ast.AST, code: str) -> None:
+        check = self._LEVEL_DISPATCH.get(self.level)
+        if check is not None:
+            check(self, code)
+
+    def _check_level2_requirements(self, code: str) -> None:
         """
         Level 2 specific checks:
         - At least one resource with URI template
         - Path validation function present
         """
         # Check for resources with URI templates
-        has_template_resource = False
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                for decorator in node.decorator_list:
-                    if self._get_decorator_type(decorator) == "resource":
-                        if isinstance(decorator, ast.Call) and decorator.args:
-                            uri_arg = decorator.args[0]
-                            if isinstance(uri_arg, ast.Constant) and "{" in str(uri_arg.value):
-                                has_template_resource = True
-                                break
-
-        if not has_template_resource and self.resources_found:
-            self.warnings.append(ValidationError(
-                type="no_uri_template",
+        if not self.has_template_resource and self.resources_found:
+            self._add_warning(
+                error_type="no_uri_template",
                 line=1,
                 message="Your Archive lacks URI templates! Consider adding dynamic resources "
                         "with parameters like @mcp.resource('archive://spells/{category}')."
-            ))
+            )
 
         # Check for path validation (security)
-        security_patterns = [
-            "is_relative_to",
-            "resolve()",
-            ".." in code and "not" in code,  # Checking for path traversal
-            "is_safe_path",
-        ]
-        has_security = any(
-            pattern in code if isinstance(pattern, str) else pattern
-            for pattern in security_patterns
+        security_patterns = ("is_relative_to", "resolve()", "is_safe_path")
+        has_security = (
+            any(pattern in code for pattern in security_patterns)
+            or (".." in code and "not" in code)  # Checking for path traversal
         )
 
         if self.resources_found and not has_security:
-            self.warnings.append(ValidationError(
-                type="missing_path_security",
+            self._add_warning(
+                error_type="missing_path_security",
                 line=1,
                 message="Your Archive lacks path security! Add validation to prevent "
                         "path traversal attacks (e.g., checking for '..' in paths)."
-            ))
+            )
         else:
             self.has_path_validation = True
 
-    def _check_level3_requirements(self, tree: ast.AST, code: str) -> None:
+    def _check_level3_requirements(self, code: str) -> None:
         """
         Level 3 specific checks:
         - httpx import present
@@ -344,64 +505,55 @@ class MCPValidator:
         """
         # Check for httpx
         if not self.has_httpx_import:
-            self.errors.append(ValidationError(
-                type="missing_httpx",
+            self._add_error(
+                error_type="missing_httpx",
                 line=1,
                 message="Your Aetheric Conduit lacks httpx! Add: import httpx"
-            ))
+            )
 
         # Check for async tools
-        has_async_tool = False
-        for node in ast.walk(tree):
-            if isinstance(node, ast.AsyncFunctionDef):
-                for decorator in node.decorator_list:
-                    if self._get_decorator_type(decorator) == "tool":
-                        has_async_tool = True
-                        break
-
-        if self.tools_found and not has_async_tool:
-            self.errors.append(ValidationError(
-                type="no_async_tools",
+        if self.tools_found and not self.has_async_tool:
+            self._add_error(
+                error_type="no_async_tools",
                 line=1,
                 message="Your API tools should use async! Change 'def' to 'async def' "
                         "for non-blocking I/O operations."
-            ))
+            )
 
         # Check for AsyncClient usage
-        async_client_patterns = ["AsyncClient", "async with httpx"]
+        async_client_patterns = ("AsyncClient", "async with httpx")
         if any(pattern in code for pattern in async_client_patterns):
             self.has_async_client = True
         elif self.has_httpx_import:
-            self.warnings.append(ValidationError(
-                type="no_async_client",
+            self._add_warning(
+                error_type="no_async_client",
                 line=1,
                 message="Consider using httpx.AsyncClient() for async HTTP requests. "
                         "Use 'async with httpx.AsyncClient() as client:' pattern."
-            ))
+            )
 
         # Check for caching
-        caching_patterns = ["_cache", "get_cached", "set_cached", "cache[", "lru_cache"]
+        caching_patterns = ("_cache", "get_cached", "set_cached", "cache[", "lru_cache")
         if any(pattern in code for pattern in caching_patterns):
             self.has_caching = True
         else:
-            self.warnings.append(ValidationError(
-                type="no_caching",
+            self._add_warning(
+                error_type="no_caching",
                 line=1,
                 message="Your Conduit lacks a Memory Stone! Consider adding caching "
                         "to reduce API calls and respect rate limits."
-            ))
+            )
 
         # Check for error handling
-        has_try_except = any(isinstance(node, ast.Try) for node in ast.walk(tree))
-        if not has_try_except:
-            self.warnings.append(ValidationError(
-                type="no_error_handling",
+        if not self.has_try_except:
+            self._add_warning(
+                error_type="no_error_handling",
                 line=1,
                 message="Your tools lack error handling! Wrap API calls in try/except "
                         "to handle timeouts and failures gracefully."
-            ))
+            )
 
-    def _check_level4_requirements(self, tree: ast.AST, code: str) -> None:
+    def _check_level4_requirements(self, code: str) -> None:
         """
         Level 4 specific checks:
         - SSE transport configuration
@@ -409,48 +561,49 @@ class MCPValidator:
         - Proper command-line argument handling
         """
         # Check for transport configuration
-        transport_patterns = ["transport=", '"sse"', "'sse'", "--transport"]
+        transport_patterns = ("transport=", '"sse"', "'sse'", "--transport")
         has_transport_config = any(pattern in code for pattern in transport_patterns)
 
         if not has_transport_config:
-            self.warnings.append(ValidationError(
-                type="no_transport_config",
+            self._add_warning(
+                error_type="no_transport_config",
                 line=1,
                 message="Your server lacks transport configuration! Add support for "
                         "SSE transport: mcp.run(transport='sse', host='0.0.0.0', port=8080)"
-            ))
+            )
 
         # Check for health check resource
-        health_patterns = ["health://", "health_check", "health_status", "/health"]
+        health_patterns = ("health://", "health_check", "health_status", "/health")
         has_health_check = any(pattern in code for pattern in health_patterns)
 
         if not has_health_check:
-            self.warnings.append(ValidationError(
-                type="no_health_check",
+            self._add_warning(
+                error_type="no_health_check",
                 line=1,
                 message="Your production server lacks a health check! Add a resource "
                         "like @mcp.resource('health://status') for monitoring."
-            ))
-
-        # Check for argument parsing (for production flexibility)
-        argparse_patterns = ["argparse", "ArgumentParser", "add_argument"]
-        has_argparse = any(pattern in code for pattern in argparse_patterns)
+            )
 
-        env_patterns = ["os.getenv", "os.environ", "dotenv"]
-        has_env_config = any(pattern in code for pattern in env_patterns)
+        # Check for argument parsing or environment config (for production
+        # flexibility); either satisfies the check, so scan them as one set
+        config_patterns = (
+            "argparse", "ArgumentParser", "add_argument",
+            "os.getenv", "os.environ", "dotenv",
+        )
+        has_external_config = any(pattern in code for pattern in config_patterns)
 
-        if not has_argparse and not has_env_config:
-            self.warnings.append(ValidationError(
-                type="hardcoded_config",
+        if not has_external_config:
+            self._add_warning(
+                error_type="hardcoded_config",
                 line=1,
                 message="Your server has hardcoded configuration! Use environment variables "
                         "or argparse for production flexibility."
-            ))
+            )
 
         # Also run Level 3 checks (Level 4 builds on Level 3)
-        self._check_level3_requirements(tree, code)
+        self._check_level3_requirements(code)
 
-    def _check_level5_requirements(self, tree: ast.AST, code: str) -> None:
+    def _check_level5_requirements(self, code: str) -> None:
         """
         Level 5 specific checks:
         Phase 2: Agent-invocation patterns in MCP tools
@@ -458,15 +611,15 @@ class MCPValidator:
         Phase 4: Multi-agent orchestration (3+ specialized agents)
         """
         # Check for Agent SDK import
-        agent_sdk_patterns = [
+        agent_sdk_patterns = (
             "from claude_agent_sdk import",
             "import claude_agent_sdk",
             "from anthropic import",  # Alternative SDK
-        ]
+        )
         has_agent_sdk = any(pattern in code for pattern in agent_sdk_patterns)
 
         # Check for Agent or AgentConfig usage
-        agent_class_patterns = ["Agent(", "AgentConfig("]
+        agent_class_patterns = ("Agent(", "AgentConfig(")
         has_agent_usage = any(pattern in code for pattern in agent_class_patterns)
 
         # Count agent configurations (for multi-agent validation)
@@ -475,115 +628,106 @@ class MCPValidator:
         # Phase 3 validation: Agent SDK integration
         if "phase3" in str(self.level).lower():
             if not has_agent_sdk:
-                self.errors.append(ValidationError(
-                    type="missing_agent_sdk",
+                self._add_error(
+                    error_type="missing_agent_sdk",
                     line=1,
                     message="Your Scrying Network lacks the Agent SDK! "
                             "Add: from claude_agent_sdk import Agent, AgentConfig"
-                ))
+                )
 
             if has_agent_sdk and not has_agent_usage:
-                self.errors.append(ValidationError(
-                    type="no_agent_instantiation",
+                self._add_error(
+                    error_type="no_agent_instantiation",
                     line=1,
                     message="You imported the Agent SDK but didn't create any agents! "
                             "Add: agent = Agent(config=AgentConfig(...))"
-                ))
+                )
 
             # Check for async patterns (required for agent execution)
-            has_async_def = any(
-                isinstance(node, ast.AsyncFunctionDef)
-                for node in ast.walk(tree)
-            )
             has_await = "await" in code
 
-            if has_agent_usage and not (has_async_def and has_await):
-                self.warnings.append(ValidationError(
-                    type="no_async_agent_execution",
+            if has_agent_usage and not (self.has_async_def and has_await):
+                self._add_warning(
+                    error_type="no_async_agent_execution",
                     line=1,
                     message="Agent execution should use async/await patterns! "
                             "Use 'async def' and 'await agent.run(...)'"
-                ))
+                )
 
         # Phase 4 validation: Multi-agent orchestration
         if "phase4" in str(self.level).lower():
             if agent_config_count < 3:
-                self.errors.append(ValidationError(
-                    type="insufficient_agents",
+                self._add_error(
+                    error_type="insufficient_agents",
                     line=1,
                     message="Your Hivemind needs at least 3 specialized agents! "
                             f"Found only {agent_config_count} AgentConfig instances. "
                             "Create specialized agents with different configurations."
-                ))
+                )
 
             # Check for state management patterns
-            state_patterns = [
-                "@dataclass",
-                "class.*State:",
-                "pipeline_state",
-                "state =",
-            ]
-            has_state_management = any(
-                re.search(pattern, code) for pattern in state_patterns
-            )
+            has_state_management = _STATE_MANAGEMENT_RE.search(code) is not None
 
             if not has_state_management:
-                self.warnings.append(ValidationError(
-                    type="no_state_management",
+                self._add_warning(
+                    error_type="no_state_management",
                     line=1,
                     message="Multi-agent systems need state management! "
                             "Consider using a dataclass or dict to pass data between agents."
-                ))
+                )
 
             # Check for sequential execution pattern
-            sequential_patterns = ["await.*step", "state = await"]
-            has_sequential = any(
-                re.search(pattern, code) for pattern in sequential_patterns
-            )
+            has_sequential = _SEQUENTIAL_EXECUTION_RE.search(code) is not None
 
             if agent_config_count >= 3 and not has_sequential:
-                self.warnings.append(ValidationError(
-                    type="no_orchestration_pattern",
+                self._add_warning(
+                    error_type="no_orchestration_pattern",
                     line=1,
                     message="Multiple agents found but no orchestration pattern detected! "
                             "Use sequential execution: state = await step1(state)"
-                ))
+                )
 
         # Phase 2 validation: Agent-invocation in MCP tools
         if "phase2" in str(self.level).lower():
             # Check for error handling (important for agent invocation)
-            has_try_except = any(isinstance(node, ast.Try) for node in ast.walk(tree))
-
-            if not has_try_except and self.tools_found:
-                self.warnings.append(ValidationError(
-                    type="no_agent_error_handling",
+            if not self.has_try_except and self.tools_found:
+                self._add_warning(
+                    error_type="no_agent_error_handling",
                     line=1,
                     message="Agent-invocation tools need error handling! "
                             "Wrap agent calls in try/except to handle timeouts and failures."
-                ))
+                )
 
         # General Level 5 recommendations
         if has_agent_usage:
             # Check for timeout configuration
             if "timeout=" not in code:
-                self.warnings.append(ValidationError(
-                    type="no_timeout_config",
+                self._add_warning(
+                    error_type="no_timeout_config",
                     line=1,
                     message="Agent configurations should include timeouts! "
                             "Add: AgentConfig(timeout=90, ...)"
-                ))
+                )
 
             # Check for model selection
-            model_patterns = ["model=", "claude-", "haiku", "sonnet", "opus"]
+            model_patterns = ("model=", "claude-", "haiku", "sonnet", "opus")
             has_model_config = any(pattern in code for pattern in model_patterns)
 
             if not has_model_config:
-                self.warnings.append(ValidationError(
-                    type="no_model_selection",
+                self._add_warning(
+                    error_type="no_model_selection",
                     line=1,
                     message="Consider explicitly setting the agent model! "
                             "Add: AgentConfig(model='claude-sonnet-4.5', ...)"
-                ))
+                )
+
+    # Level-specific checks, looked up by _check_level_specific
+    _LEVEL_DISPATCH = {
+        "level2": _check_level2_requirements,
+        "level3": _check_level3_requirements,
+        "level4": _check_level4_requirements,
+        "level5": _check_level5_requirements,
+    }
 
     def _build_response(self) -> ValidationResponse:
         """Build the final validation response."""
@@ -600,11 +744,31 @@ class MCPValidator:
         )
 
 
+# Batches smaller than this are validated serially; process startup
+# would cost more than it saves
+BATCH_PARALLEL_THRESHOLD = 8
+
+# Batch workers must not be forked from the server: it runs several threads,
+# and a child forked while another thread holds a lock (e.g. the parse
+# cache's) deadlocks. A forkserver is forked once from a clean process and
+# preloads this module; spawn is the fallback where it is unavailable.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _BATCH_MP_CONTEXT = multiprocessing.get_context("forkserver")
+    _BATCH_MP_CONTEXT.set_forkserver_preload([__name__])
+else:
+    _BATCH_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# One reusable validator per thread (requests run on the event loop or
+# in the threadpool, never concurrently on the same thread)
+_local = threading.local()
+
+
 def validate_code(code: str, level: Optional[str] = None) -> ValidationResponse:
     """
     Validate MCP server code.
 
-    Creates a new validator instance per request to ensure thread safety.
+    Reuses a per-thread validator instance; validate() resets all of its
+    state (with fresh result lists), so requests never share results.
 
     Args:
         code: Python source code to validate
@@ -613,4 +777,37 @@ def validate_code(code: str, level: Optional[str] = None) -> ValidationResponse:
     Returns:
         ValidationResponse with the Inspector's verdict
     """
-    return MCPValidator(level=level).validate(code)
+    validator = getattr(_local, "validator", None)
+    if validator is None:
+        validator = _local.validator = MCPValidator()
+    validator.level = level
+    return validator.validate(code)
+
+
+def validate_batch(
+    codes: list[str],
+    level: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> list[ValidationResponse]:
+    """
+    Validate many submissions, in parallel across processes when worthwhile.
+
+    Validation is pure-Python CPU work, so threads would serialize on the
+    GIL. Small batches run serially in the calling thread. This blocks
+    the caller; from async code, call it via run_in_threadpool.
+
+    Args:
+        codes: Python source code of each submission
+        level: Optional level for level-specific validation rules
+        max_workers: Worker processes to use (defaults to the CPU count)
+
+    Returns:
+        One ValidationResponse per submission, in input order
+    """
+    if len(codes) < BATCH_PARALLEL_THRESHOLD:
+        return [validate_code(code, level) for code in codes]
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(codes) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_BATCH_MP_CONTEXT) as executor:
+        return list(executor.map(validate_code, codes, repeat(level), chunksize=chunksize))
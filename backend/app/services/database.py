@@ -5,25 +5,93 @@ Provides access to user_progress and code_snippets tables.
 Falls back to in-memory storage if Supabase is not configured.
 """
 
+import asyncio
 import logging
-import threading
 import uuid
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
-from typing import Optional
+from functools import cache
+from itertools import islice
+from typing import TYPE_CHECKING, Optional
 
-from supabase import create_client, Client
+import orjson
 
 from app.config import get_settings
 from app.models.schemas import ProgressEntry
 
+if TYPE_CHECKING:
+    from postgrest import APIResponse, AsyncRequestBuilder, CountMethod, ReturnMethod
+    from supabase import AsyncClient
+
 logger = logging.getLogger(__name__)
 
+# Columns the API actually returns, so PostgREST doesn't send the rest
+PROGRESS_COLUMNS = "level_id,phase_id,completed,code_snapshot,mode"
+SNIPPET_COLUMNS = "id,level_id,title,code,is_valid,validation_result,created_at"
+
+# Shared HTTP connection pool for all Supabase calls in this process
+HTTP_MAX_CONNECTIONS = 40
+HTTP_MAX_KEEPALIVE = 20
+HTTP_TIMEOUT_SECONDS = 10.0
+
+# Retries for requests that fail on the network (not on a PostgREST error)
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.1
+
+# Users kept by each in-memory (development) store before evicting
+MEMORY_STORE_MAX_USERS = 10_000
+
 
 class DatabaseError(Exception):
     """Raised when a database operation fails."""
     pass
 
 
+class _LRUStore(OrderedDict):
+    """Per-user in-memory store that evicts the least recently used user."""
+
+    def __init__(self, name: str, maxsize: int = MEMORY_STORE_MAX_USERS):
+        super().__init__()
+        self.name = name
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        self[key] = default
+        return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            evicted, _ = self.popitem(last=False)
+            logger.warning(
+                f"In-memory {self.name} store full ({self.maxsize} users), "
+                f"dropped data for user {evicted}"
+            )
+
+
+def _progress_entry(row: dict) -> ProgressEntry:
+    """Build a ProgressEntry from a user_progress row."""
+    # Rows come from our own schema, so skip per-row validation
+    return ProgressEntry.model_construct(
+        level_id=row["level_id"],
+        phase_id=row["phase_id"],
+        completed=bool(row["completed"]),
+        code_snapshot=row.get("code_snapshot"),
+        mode=row.get("mode", "mtg"),
+    )
+
+
 class DatabaseService:
     """
     Database service for The Artificer's Academy.
@@ -31,25 +99,73 @@ class DatabaseService:
     Uses Supabase when configured, falls back to in-memory storage
     for development without Supabase setup.
 
-    Note: Methods are synchronous as the Supabase Python client is sync.
+    Methods are async and use Supabase's httpx-based AsyncClient, so a
+    request waiting on the database does not hold a worker thread.
     """
 
     def __init__(self):
-        self._client: Optional[Client] = None
-        self._memory_store: dict[str, list[ProgressEntry]] = {}
-        self._memory_snippets: dict[str, list[dict]] = {}
-        self._memory_preferences: dict[str, str] = {}
+        self._client: Optional["AsyncClient"] = None
+        # Table builders hold no per-query state, so one each is reused
+        self._progress_table: Optional["AsyncRequestBuilder"] = None
+        self._snippets_table: Optional["AsyncRequestBuilder"] = None
+        self._preferences_table: Optional["AsyncRequestBuilder"] = None
+        # httpx/postgrest names, resolved once by _init_client
+        self._retryable_errors: tuple[type[Exception], ...] = ()
+        self._unsent_errors: tuple[type[Exception], ...] = ()
+        self._api_error: Optional[type[Exception]] = None
+        self._api_response: Optional[type["APIResponse"]] = None
+        self._return_minimal: Optional["ReturnMethod"] = None
+        self._count_exact: Optional["CountMethod"] = None
+        # user_id -> {(mode, level_id, phase_id): entry}
+        self._memory_store: dict[str, dict[tuple[str, str, str], ProgressEntry]] = _LRUStore("progress")
+        # user_id -> {snippet_id: row}
+        self._memory_snippets: dict[str, dict[str, dict]] = _LRUStore("snippets")
+        self._memory_preferences: dict[str, str] = _LRUStore("preferences")
         self._init_client()
 
     def _init_client(self):
         """Initialize Supabase client if configured."""
         settings = get_settings()
         if settings.is_configured:
+            # Imported lazily: supabase pulls in a large dependency tree that
+            # in-memory (development) mode never needs
+            import httpx
+            from postgrest import APIError, APIResponse, CountMethod, ReturnMethod
+            from supabase import AsyncClient, AsyncClientOptions
+
+            # Network failures _execute retries; the second set means the
+            # request never reached PostgREST, so even writes can be resent
+            self._retryable_errors = (httpx.TransportError,)
+            self._unsent_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+            self._api_error = APIError
+            self._api_response = APIResponse
+            # Writes only need the affected-row count (or nothing) back
+            self._return_minimal = ReturnMethod.minimal
+            self._count_exact = CountMethod.exact
+
             try:
-                self._client = create_client(
+                # One keep-alive pool for the process lifetime, so calls reuse
+                # TCP/TLS connections; the default 120s timeout is too long
+                # to hold a request open
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    ),
+                    timeout=HTTP_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                    http2=True,
+                )
+                # With a service key there is no session to fetch, so the
+                # client needs no awaited setup (unlike acreate_client)
+                self._client = AsyncClient(
                     settings.supabase_url,
-                    settings.supabase_service_key
+                    settings.supabase_service_key,
+                    options=AsyncClientOptions(httpx_client=http_client),
                 )
+                self._progress_table = self._client.table("user_progress")
+                self._snippets_table = self._client.table("code_snippets")
+                self._preferences_table = self._client.table("user_preferences")
                 logger.info("Supabase client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase client: {e}")
@@ -60,38 +176,125 @@ class DatabaseService:
         """Check if connected to Supabase."""
         return self._client is not None
 
+    async def _execute(
+        self, query, idempotent: bool = True, fast_decode: bool = False
+    ) -> "APIResponse":
+        """
+        Execute a PostgREST query, retrying transient network failures.
+
+        Errors returned by PostgREST itself (APIError, e.g. a constraint
+        violation) are raised immediately. Non-idempotent queries are only
+        retried when the request never reached the server. fast_decode
+        sends the query through _fetch_rows instead of query.execute().
+        """
+        retryable = self._retryable_errors if idempotent else self._unsent_errors
+        for attempt in range(MAX_RETRIES):
+            try:
+                if fast_decode:
+                    return await self._fetch_rows(query)
+                return await query.execute()
+            except retryable as e:
+                logger.warning(f"Database request failed (attempt {attempt + 1}), retrying: {e}")
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+        if fast_decode:
+            return await self._fetch_rows(query)
+        return await query.execute()
+
+    async def _fetch_rows(self, query) -> "APIResponse":
+        """
+        Send a row-returning select and decode the rows with orjson.
+
+        postgrest-py decodes responses through a pydantic JSON adapter,
+        which is over 10x slower than orjson on snippet pages carrying
+        large code blobs. Only used for the snippet listing, which needs
+        no row count; every other query goes through query.execute().
+        Mirrors AsyncQueryRequestBuilder.execute() and
+        APIResponse.from_http_request_response() in postgrest 2.27.
+        """
+        r = await query.request.send()
+        if not r.is_success:
+            try:
+                error = orjson.loads(r.content)
+            except orjson.JSONDecodeError:
+                error = None
+            if not isinstance(error, dict):
+                error = {
+                    "message": "JSON could not be generated",
+                    "code": r.status_code,
+                    "hint": "Refer to full message for details",
+                    "details": str(r.content),
+                }
+            raise self._api_error(error)
+
+        try:
+            data = orjson.loads(r.content)
+        except orjson.JSONDecodeError:
+            data = r.text if r.text else []
+        return self._api_response.model_construct(data=data, count=None)
+
+    async def close(self) -> None:
+        """Close pooled Supabase connections."""
+        if self._client is not None:
+            await self._client.postgrest.session.aclose()
+
     # ==========================================
     # Progress Methods
     # ==========================================
 
-    def get_progress(self, user_id: str, mode: str = "mtg") -> list[ProgressEntry]:
+    async def get_progress(self, user_id: str, mode: str = "mtg") -> list[ProgressEntry]:
         """Get all progress entries for a user filtered by mode."""
         if not self.is_connected:
-            entries = self._memory_store.get(user_id, [])
-            return [e for e in entries if e.mode == mode]
+            entries = self._memory_store.get(user_id, {})
+            return [e for e in entries.values() if e.mode == mode]
 
         try:
-            response = self._client.table("user_progress") \
-                .select("*") \
+            query = self._progress_table \
+                .select(PROGRESS_COLUMNS) \
                 .eq("user_id", user_id) \
-                .eq("mode", mode) \
-                .execute()
-
-            return [
-                ProgressEntry(
-                    level_id=row["level_id"],
-                    phase_id=row["phase_id"],
-                    completed=row["completed"],
-                    code_snapshot=row.get("code_snapshot"),
-                    mode=row.get("mode", "mtg"),
-                )
-                for row in response.data
-            ]
+                .eq("mode", mode)
+            response = await self._execute(query)
+
+            return [_progress_entry(row) for row in response.data]
         except Exception as e:
             logger.error(f"Failed to get progress for user {user_id}: {e}")
             raise DatabaseError(f"Failed to retrieve progress: {e}")
 
-    def upsert_progress(
+    async def get_progress_bulk(
+        self, user_ids: list[str], mode: str = "mtg"
+    ) -> dict[str, list[ProgressEntry]]:
+        """
+        Get progress entries for several users filtered by mode.
+
+        Issues a single IN query instead of one request per user. Every
+        requested user has a key in the result, even with no progress.
+        """
+        progress: dict[str, list[ProgressEntry]] = {user_id: [] for user_id in user_ids}
+        if not progress:
+            return progress
+
+        if not self.is_connected:
+            for user_id, entries in progress.items():
+                stored = self._memory_store.get(user_id, {})
+                entries.extend(e for e in stored.values() if e.mode == mode)
+            return progress
+
+        try:
+            query = self._progress_table \
+                .select(f"user_id,{PROGRESS_COLUMNS}") \
+                .in_("user_id", list(progress)) \
+                .eq("mode", mode)
+            response = await self._execute(query)
+
+            grouped: defaultdict[str, list[ProgressEntry]] = defaultdict(list)
+            for row in response.data:
+                grouped[row["user_id"]].append(_progress_entry(row))
+            progress.update(grouped)
+            return progress
+        except Exception as e:
+            logger.error(f"Failed to get progress for {len(progress)} users: {e}")
+            raise DatabaseError(f"Failed to retrieve progress: {e}")
+
+    async def upsert_progress(
         self,
         user_id: str,
         level_id: str,
@@ -103,28 +306,22 @@ class DatabaseService:
         """Insert or update progress for a user/level/phase/mode."""
         if not self.is_connected:
             # In-memory fallback
-            if user_id not in self._memory_store:
-                self._memory_store[user_id] = []
-
-            # Find existing entry
-            existing = None
-            for entry in self._memory_store[user_id]:
-                if entry.level_id == level_id and entry.phase_id == phase_id and entry.mode == mode:
-                    existing = entry
-                    break
+            entries = self._memory_store.setdefault(user_id, {})
+            key = (mode, level_id, phase_id)
+            existing = entries.get(key)
 
             if existing:
                 existing.completed = completed
                 if code_snapshot:
                     existing.code_snapshot = code_snapshot
             else:
-                self._memory_store[user_id].append(ProgressEntry(
+                entries[key] = ProgressEntry(
                     level_id=level_id,
                     phase_id=phase_id,
                     completed=completed,
                     code_snapshot=code_snapshot,
                     mode=mode,
-                ))
+                )
             return
 
         try:
@@ -140,12 +337,14 @@ class DatabaseService:
             if code_snapshot:
                 data["code_snapshot"] = code_snapshot
 
-            if completed:
-                data["completed_at"] = datetime.now(timezone.utc).isoformat()
-
-            self._client.table("user_progress") \
-                .upsert(data, on_conflict="user_id,mode,level_id,phase_id") \
-                .execute()
+            # completed_at is stamped by a trigger (migration 003)
+            query = self._progress_table \
+                .upsert(
+                    data,
+                    on_conflict="user_id,mode,level_id,phase_id",
+                    returning=self._return_minimal,
+                )
+            await self._execute(query)
         except Exception as e:
             logger.error(f"Failed to upsert progress for user {user_id}: {e}")
             raise DatabaseError(f"Failed to save progress: {e}")
@@ -154,7 +353,7 @@ class DatabaseService:
     # Code Snippets Methods
     # ==========================================
 
-    def save_snippet(
+    async def save_snippet(
         self,
         user_id: str,
         level_id: str,
@@ -164,12 +363,11 @@ class DatabaseService:
         validation_result: Optional[dict] = None,
     ) -> str:
         """Save a code snippet and return its ID."""
+        snippet_id = str(uuid.uuid4())
+
         if not self.is_connected:
-            # In-memory fallback with unique ID
-            snippet_id = str(uuid.uuid4())
-            if user_id not in self._memory_snippets:
-                self._memory_snippets[user_id] = []
-            self._memory_snippets[user_id].append({
+            # In-memory fallback
+            self._memory_snippets.setdefault(user_id, {})[snippet_id] = {
                 "id": snippet_id,
                 "user_id": user_id,
                 "level_id": level_id,
@@ -178,67 +376,92 @@ class DatabaseService:
                 "is_valid": is_valid,
                 "validation_result": validation_result,
                 "created_at": datetime.now(timezone.utc).isoformat(),
-            })
+            }
             return snippet_id
 
         try:
-            response = self._client.table("code_snippets") \
+            # The ID is generated here, so the inserted row (including the
+            # code) doesn't need to be sent back
+            query = self._snippets_table \
                 .insert({
+                    "id": snippet_id,
                     "user_id": user_id,
                     "level_id": level_id,
                     "title": title,
                     "code": code,
                     "is_valid": is_valid,
                     "validation_result": validation_result,
-                }) \
-                .execute()
+                }, returning=self._return_minimal)
+            await self._execute(query, idempotent=False)
 
-            return response.data[0]["id"]
+            return snippet_id
         except Exception as e:
             logger.error(f"Failed to save snippet for user {user_id}: {e}")
             raise DatabaseError(f"Failed to save snippet: {e}")
 
-    def get_snippets(self, user_id: str, level_id: Optional[str] = None) -> list[dict]:
-        """Get code snippets for a user, optionally filtered by level."""
+    async def get_snippets(
+        self,
+        user_id: str,
+        level_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Get a page of a user's code snippets (newest first), optionally filtered by level."""
         if not self.is_connected:
-            snippets = self._memory_snippets.get(user_id, [])
+            # Rows are stored in creation order, so newest first is just reversed
+            snippets = reversed(self._memory_snippets.get(user_id, {}).values())
             if level_id:
-                snippets = [s for s in snippets if s["level_id"] == level_id]
-            return sorted(snippets, key=lambda x: x["created_at"], reverse=True)
+                snippets = (s for s in snippets if s["level_id"] == level_id)
+            return list(islice(snippets, offset, offset + limit))
 
         try:
-            query = self._client.table("code_snippets") \
-                .select("*") \
+            query = self._snippets_table \
+                .select(SNIPPET_COLUMNS) \
                 .eq("user_id", user_id)
 
             if level_id:
                 query = query.eq("level_id", level_id)
 
-            response = query.order("created_at", desc=True).execute()
+            query = query \
+                .order("created_at", desc=True) \
+                .range(offset, offset + limit - 1)
+            response = await self._execute(query, fast_decode=True)
             return response.data
         except Exception as e:
             logger.error(f"Failed to get snippets for user {user_id}: {e}")
             raise DatabaseError(f"Failed to retrieve snippets: {e}")
 
-    def delete_snippet(self, user_id: str, snippet_id: str) -> bool:
+    async def iter_snippets(
+        self,
+        user_id: str,
+        level_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield all of a user's snippets (newest first) in batches of batch_size."""
+        offset = 0
+        while True:
+            rows = await self.get_snippets(user_id, level_id, limit=batch_size, offset=offset)
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            offset += batch_size
+
+    async def delete_snippet(self, user_id: str, snippet_id: str) -> bool:
         """Delete a code snippet. Returns True if deleted."""
         if not self.is_connected:
-            if user_id in self._memory_snippets:
-                original_len = len(self._memory_snippets[user_id])
-                self._memory_snippets[user_id] = [
-                    s for s in self._memory_snippets[user_id] if s["id"] != snippet_id
-                ]
-                return len(self._memory_snippets[user_id]) < original_len
-            return False
+            snippets = self._memory_snippets.get(user_id, {})
+            return snippets.pop(snippet_id, None) is not None
 
         try:
-            response = self._client.table("code_snippets") \
-                .delete() \
+            # Only the number of deleted rows is needed, not the rows themselves
+            query = self._snippets_table \
+                .delete(count=self._count_exact, returning=self._return_minimal) \
                 .eq("id", snippet_id) \
-                .eq("user_id", user_id) \
-                .execute()
+                .eq("user_id", user_id)
+            response = await self._execute(query, idempotent=False)
 
-            return len(response.data) > 0
+            return bool(response.count)
         except Exception as e:
             logger.error(f"Failed to delete snippet {snippet_id}: {e}")
             raise DatabaseError(f"Failed to delete snippet: {e}")
@@ -248,16 +471,16 @@ class DatabaseService:
     # User Preferences Methods
     # ==========================================
 
-    def get_user_preference(self, user_id: str) -> str:
+    async def get_user_preference(self, user_id: str) -> str:
         """Get a user's active learning mode. Returns 'mtg' if not set."""
         if not self.is_connected:
             return self._memory_preferences.get(user_id, "mtg")
 
         try:
-            response = self._client.table("user_preferences") \
+            query = self._preferences_table \
                 .select("active_mode") \
-                .eq("user_id", user_id) \
-                .execute()
+                .eq("user_id", user_id)
+            response = await self._execute(query)
 
             if response.data:
                 return response.data[0]["active_mode"]
@@ -266,35 +489,31 @@ class DatabaseService:
             logger.error(f"Failed to get preference for user {user_id}: {e}")
             return "mtg"
 
-    def set_user_preference(self, user_id: str, mode: str) -> None:
+    async def set_user_preference(self, user_id: str, mode: str) -> None:
         """Set a user's active learning mode."""
         if not self.is_connected:
             self._memory_preferences[user_id] = mode
             return
 
         try:
-            self._client.table("user_preferences") \
+            query = self._preferences_table \
                 .upsert(
                     {"user_id": user_id, "active_mode": mode},
                     on_conflict="user_id",
-                ) \
-                .execute()
+                    returning=self._return_minimal,
+                )
+            await self._execute(query)
         except Exception as e:
             logger.error(f"Failed to set preference for user {user_id}: {e}")
             raise DatabaseError(f"Failed to save preference: {e}")
 
 
-# Thread-safe singleton
-_db_service: Optional[DatabaseService] = None
-_db_lock = threading.Lock()
-
-
+@cache
 def get_database() -> DatabaseService:
-    """Get the database service instance (thread-safe singleton)."""
-    global _db_service
-    if _db_service is None:
-        with _db_lock:
-            # Double-check locking pattern
-            if _db_service is None:
-                _db_service = DatabaseService()
-    return _db_service
+    """
+    Get the database service instance (singleton).
+
+    First called from the app's lifespan (via the health check warmup),
+    before any request can race to create a second instance.
+    """
+    return DatabaseService()
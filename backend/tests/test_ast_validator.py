@@ -0,0 +1,40 @@
+"""Tests for the AST validation service."""
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.ast_validator import (
+    BATCH_PARALLEL_THRESHOLD,
+    validate_batch,
+    validate_code,
+)
+
+VALID_SERVER = '''from fastmcp import FastMCP
+
+mcp = FastMCP("Archive")
+
+
+@mcp.tool()
+def lookup(name: str) -> str:
+    """Look up a card by name."""
+    return name
+'''
+
+SYNTAX_ERROR = "def broken(:\n    pass\n"
+
+
+def test_validate_batch_from_worker_thread():
+    """A parallel batch started off the main thread (as run_in_threadpool does)."""
+    codes = [VALID_SERVER, SYNTAX_ERROR] * BATCH_PARALLEL_THRESHOLD
+
+    # os.fork() reports forking a multi-threaded process as a warning it
+    # cannot raise, so record warnings rather than turning them into errors
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            results = pool.submit(validate_batch, codes, None, 2).result(timeout=60)
+
+    assert not [w for w in caught if "fork()" in str(w.message)]
+    assert results == [validate_code(code) for code in codes]
+    assert results[0].valid
+    assert not results[1].valid
@@ -0,0 +1,25 @@
+-- Migration: Stamp completed_at in the database
+-- The backend no longer sends completed_at with each progress upsert;
+-- Postgres sets it whenever a row is saved as completed.
+
+-- 1. Set completed_at to now() on completed rows unless the writer
+--    supplied its own value (e.g. when backdating)
+CREATE OR REPLACE FUNCTION set_progress_completed_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.completed THEN
+        IF TG_OP = 'INSERT' THEN
+            NEW.completed_at = COALESCE(NEW.completed_at, now());
+        ELSIF NEW.completed_at IS NOT DISTINCT FROM OLD.completed_at THEN
+            NEW.completed_at = now();
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 2. Fire on both halves of an upsert (INSERT ... ON CONFLICT DO UPDATE)
+CREATE TRIGGER set_user_progress_completed_at
+BEFORE INSERT OR UPDATE ON user_progress
+FOR EACH ROW
+EXECUTE FUNCTION set_progress_completed_at();